@@ -1,56 +1,575 @@
 import os
-import requests
-import traceback
+import time
+import asyncio
+import httpx
+import orjson
+import logging
+import threading
+import itertools
+from operator import itemgetter
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
+# Comma-separated tokens to rotate between; falls back to GITHUB_TOKEN
+GITHUB_TOKENS = [
+    token.strip()
+    for token in os.getenv('GITHUB_TOKENS', GITHUB_TOKEN or '').split(',')
+    if token.strip()
+]
+
+# Default headers and URL template shared by every GitHub request; the
+# Authorization header is added per request by the token pool
+_HEADERS = {'Accept': 'application/vnd.github.v3+json'}
+_PR_URL_TMPL = "https://api.github.com/repos/{}/{}/pulls/{}"
+
+# The files endpoint is paginated; 100 is the largest page size GitHub allows
+FILES_PER_PAGE = 100
+# Upper bound on concurrent page requests when fanning out pagination
+MAX_CONCURRENT_PAGES = 10
+
+# GraphQL endpoint and the PR query behind `fetch_pr_overview`, which
+# returns the changed-file list without diffs in one request
+GRAPHQL_URL = "https://api.github.com/graphql"
+PR_FILES_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      title
+      body
+      author { login }
+      createdAt
+      updatedAt
+      state
+      files(first: 100, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { path additions deletions changeType }
+      }
+    }
+  }
+}
+"""
+# GraphQL changeType values that differ from the REST `status` field
+_CHANGE_TYPE_STATUS = {'DELETED': 'removed'}
+
+# Required per-file fields, fetched in one C-level call per file
+_SUMMARY_FIELDS = ('filename', 'status', 'additions', 'deletions', 'changes')
+_GET_FILE = itemgetter(*_SUMMARY_FIELDS)
+
+# Connection pool sizing for the shared client; over HTTP/2 concurrent
+# requests are multiplexed on one connection, so a few suffice
+POOL_MAX_CONNECTIONS = 10
+POOL_MAX_KEEPALIVE = 5
+# Failed connection attempts are retried by the httpx transport itself;
+# _send retries other transport errors for idempotent requests
+CONNECT_RETRIES = 5
+# Transient error statuses are retried with exponential backoff
+MAX_RETRIES = 5
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# A non-idempotent request may already have been processed when a 500, 502
+# or 504 comes back, so it is only retried when GitHub rejected it outright
+NON_IDEMPOTENT_RETRY_STATUSES = (429, 503)
+# Start holding requests back once fewer than this many remain in the window
+RATE_LIMIT_THRESHOLD = 100
+
+# On-disk cache of ETags and payloads for conditional requests; one entry
+# per URL (and page), least recently used entries are evicted past the cap
+ETAG_CACHE_PATH = os.getenv(
+    'GITHUB_ETAG_CACHE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.etag_cache.json')
+)
+ETAG_CACHE_SIZE = 256
+
+# In-process cache of recent fetch_pr_changes results, checked before any HTTP
+PR_CACHE_TTL = 30
+PR_CACHE_SIZE = 128
+_pr_cache = TTLCache(maxsize=PR_CACHE_SIZE, ttl=PR_CACHE_TTL)
+_pr_cache_lock = threading.Lock()
+
+# Shared HTTP/2 client, created lazily on the running event loop
+_client = None
+_client_loop = None
+_client_closer = None
+
+
+async def _close_on_shutdown(client: httpx.AsyncClient):
+    """Idle until cancelled, then close the client.
+
+    `asyncio.run` cancels outstanding tasks before closing its loop, so this
+    closes the client's connections while the loop that owns them still runs.
+    """
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await client.aclose()
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared httpx client, creating it if needed.
+
+    A client is bound to the loop it was created on. When the loop changes,
+    e.g. across `fetch_pr_changes_sync` calls, a new client is created and
+    the previous one is closed as its own loop shuts down.
+    """
+    global _client, _client_loop, _client_closer
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        if _client_closer is not None and _client_loop is loop:
+            _client_closer.cancel()
+        _client = httpx.AsyncClient(
+            headers=_HEADERS,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=CONNECT_RETRIES,
+                limits=httpx.Limits(
+                    max_keepalive_connections=POOL_MAX_KEEPALIVE,
+                    max_connections=POOL_MAX_CONNECTIONS
+                )
+            )
+        )
+        _client_loop = loop
+        _client_closer = loop.create_task(_close_on_shutdown(_client))
+    return _client
+
+
+async def _release_client(client: httpx.AsyncClient):
+    """Close `client`, and forget it if it is still the shared one."""
+    global _client, _client_loop, _client_closer
+    if _client is client:
+        if _client_closer is not None:
+            _client_closer.cancel()
+        _client = None
+        _client_loop = None
+        _client_closer = None
+    if not client.is_closed:
+        await client.aclose()
+
+
+async def close_client():
+    """Close the shared httpx client if it belongs to the running loop.
+
+    A client bound to another loop, e.g. one in use on another thread, is
+    left alone; it is closed as its own loop shuts down.
+    """
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _release_client(_client)
+
+
+class ETagCache:
+    """JSON-file cache mapping request keys to their last ETag and payload.
+
+    One instance is shared by all fetches in the process. It is loaded
+    from disk on first use and holds at most `maxsize` entries. File reads
+    and writes run in a worker thread, off the event loop.
+    """
+
+    def __init__(self, path: str = ETAG_CACHE_PATH, maxsize: int = ETAG_CACHE_SIZE):
+        self.path = path
+        self._entries = LRUCache(maxsize=maxsize)
+        self._loaded = False
+        self._version = 0
+        self._written_version = 0
+        self._write_lock = threading.Lock()
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, 'rb') as f:
+                return orjson.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries: dict, version: int):
+        with self._write_lock:
+            # A newer snapshot may already have been written by another thread
+            if version <= self._written_version:
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(orjson.dumps(entries))
+            os.replace(tmp_path, self.path)
+            self._written_version = version
+
+    async def load(self):
+        """Read the cache file once; later calls return immediately."""
+        if self._loaded:
+            return
+        entries = await asyncio.to_thread(self._read)
+        if self._loaded:
+            return
+        for key, entry in entries.items():
+            # Entries set while the file was being read are newer
+            if key not in self._entries:
+                self._entries[key] = entry
+        self._loaded = True
+
+    def get(self, key: str):
+        return self._entries.get(key)
+
+    def set(self, key: str, etag: str, payload, last_page: int, pr_version: str = None):
+        self._entries[key] = {
+            'etag': etag, 'payload': payload, 'last_page': last_page, 'pr_version': pr_version
+        }
+        self._version += 1
+
+    def set_pr_version(self, key: str, pr_version: str):
+        """Record which PR state (its `updated_at`) an entry was fetched for."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.get('pr_version') != pr_version:
+            entry['pr_version'] = pr_version
+            self._version += 1
+
+    async def save(self):
+        """Write the cache back to disk if anything changed since the last save."""
+        if self._version == self._written_version:
+            return
+        await asyncio.to_thread(self._write, dict(self._entries), self._version)
+
+
+_etag_cache = ETagCache()
+
+
+def _resource_for(url: str) -> str:
+    """Name of the GitHub rate-limit resource a request to `url` counts against."""
+    return 'graphql' if url == GRAPHQL_URL else 'core'
+
+
+class RateLimitGate:
+    """Client-side view of one GitHub rate-limit resource, fed from response headers.
+
+    GitHub keeps separate budgets per resource (`core`, `graphql`, ...) and names
+    the one a response counted against in `X-RateLimit-Resource`; responses for
+    other resources are ignored.
+    """
+
+    def __init__(self, resource: str = 'core', threshold: int = RATE_LIMIT_THRESHOLD):
+        self.resource = resource
+        self.threshold = threshold
+        self.remaining = None
+        self.reset_at = 0.0
+
+    def tracks(self, response) -> bool:
+        """Whether the response counted against this gate's resource."""
+        return response.headers.get('X-RateLimit-Resource', self.resource) == self.resource
+
+    def update(self, response):
+        """Record the rate-limit headers of a response for this resource."""
+        if not self.tracks(response):
+            return
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset is not None:
+            self.reset_at = float(reset)
+
+    def exhausted(self) -> bool:
+        """Whether the budget is too low and the window has not reset yet."""
+        return (
+            self.remaining is not None
+            and self.remaining <= self.threshold
+            and self.reset_at > time.time()
+        )
+
+    def block(self, delay: float):
+        """Treat the budget as spent for the next `delay` seconds."""
+        self.remaining = 0
+        self.reset_at = time.time() + delay
+
+    async def acquire(self):
+        """Wait for the window to reset if the remaining budget is too low."""
+        if self.remaining is None or self.remaining > self.threshold:
+            return
+        delay = self.reset_at - time.time()
+        if delay > 0:
+            logger.warning("Rate limit nearly exhausted, waiting %.0fs for reset", delay)
+            await asyncio.sleep(delay)
+        self.remaining = None
+
+    @staticmethod
+    def retry_delay(response):
+        """Seconds to wait before retrying a rate-limited response, or None."""
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            return float(retry_after)
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            reset = response.headers.get('X-RateLimit-Reset')
+            return max(0.0, float(reset) - time.time()) if reset is not None else 60.0
+        return None
+
+
+class TokenPool:
+    """Round-robin over GitHub tokens, with a rate-limit gate per (token, resource)."""
+
+    def __init__(self, tokens: list):
+        # A pool without tokens sends unauthenticated requests
+        self._tokens = list(tokens) or [None]
+        self._gates = {}
+        self._cycle = itertools.cycle(self._tokens)
+
+    def gate(self, token, resource: str = 'core') -> RateLimitGate:
+        gate = self._gates.get((token, resource))
+        if gate is None:
+            gate = self._gates[(token, resource)] = RateLimitGate(resource)
+        return gate
+
+    async def acquire(self, resource: str = 'core'):
+        """Return the next token with `resource` budget left, skipping exhausted ones.
+
+        Only the budget of the resource about to be hit is considered. If every
+        token is exhausted for it, wait for whichever resets first.
+        """
+        for _ in range(len(self._tokens)):
+            token = next(self._cycle)
+            if not self.gate(token, resource).exhausted():
+                return token
+        token = min(self._tokens, key=lambda t: self.gate(t, resource).reset_at)
+        await self.gate(token, resource).acquire()
+        return token
+
+
+_token_pool = TokenPool(GITHUB_TOKENS)
+
+
+def _url(repo_owner: str, repo_name: str, pr_number: int, suffix: str = "") -> str:
+    """Build a pull request API URL, optionally for a sub-resource."""
+    return _PR_URL_TMPL.format(repo_owner, repo_name, pr_number) + suffix
+
+
+def _last_page(response) -> int:
+    """Return the page number of the `rel="last"` link, or 1 if there is none."""
+    last = response.links.get('last')
+    if last is None:
+        return 1
+    return int(httpx.URL(last['url']).params.get('page', 1))
+
+
+async def _send(client: httpx.AsyncClient, method: str, url: str, idempotent: bool = None, **kwargs):
+    """Send a request, retrying transient error statuses with exponential backoff.
+
+    `idempotent` defaults to True for GET only. Requests that are not
+    idempotent, like creating a review, are retried on 429 and 503 alone so
+    a retry can't post the same thing twice. Failures to connect are already
+    retried by the client's transport; other transport errors, such as read
+    timeouts or a reset HTTP/2 stream, may come after the request was sent
+    and are retried with backoff for idempotent requests only.
+    Each attempt takes a token from the pool, skipping tokens that are close
+    to their rate limit. A rate-limited token is held back for as long as
+    GitHub asks and the request is retried with the next one, waiting only
+    when every token is held back. Returns the response together with its body.
+    """
+    headers = kwargs.pop('headers', None) or {}
+    if idempotent is None:
+        idempotent = method == 'GET'
+    retry_statuses = RETRY_STATUSES if idempotent else NON_IDEMPOTENT_RETRY_STATUSES
+    resource = _resource_for(url)
+    for attempt in range(MAX_RETRIES + 1):
+        token = await _token_pool.acquire(resource)
+        request_headers = {**headers, 'Authorization': f'token {token}'} if token else headers
+        try:
+            response = await client.request(method, url, headers=request_headers, **kwargs)
+        except httpx.TransportError as e:
+            if not idempotent or attempt == MAX_RETRIES:
+                raise
+            logger.warning("Request to %s failed (%s), retrying", url, e)
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+            continue
+        body = response.content
+
+        # Account the response against the resource GitHub says it used
+        charged = response.headers.get('X-RateLimit-Resource', resource)
+        gate = _token_pool.gate(token, charged)
+        gate.update(response)
+        if attempt < MAX_RETRIES:
+            delay = gate.retry_delay(response)
+            if delay is not None:
+                logger.warning("Rate limited by GitHub, holding token back for %.0fs", delay)
+                gate.block(delay)
+                if charged != resource:
+                    # The pool picks tokens by `resource`, so it won't wait on this gate
+                    await asyncio.sleep(delay)
+                continue
+            if response.status_code in retry_statuses:
+                await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+                continue
+        return response, body
+
+
+def _slim_pr(pr_data: dict) -> dict:
+    """Keep only the PR metadata fields that end up in `pr_info`."""
+    return {
+        'title': pr_data['title'],
+        'body': pr_data['body'],
+        'user': {'login': pr_data['user']['login']},
+        'created_at': pr_data['created_at'],
+        'updated_at': pr_data['updated_at'],
+        'state': pr_data['state']
+    }
+
+
+def _slim_files(files_data: list) -> list:
+    """Reduce a page of the files endpoint to the per-file change dicts."""
+    changes = []
+    append = changes.append
+    for f in files_data:
+        filename, status, additions, deletions, total = _GET_FILE(f)
+        append({
+            'filename': filename,
+            'status': status,  # added, modified, removed
+            'additions': additions,
+            'deletions': deletions,
+            'changes': total,
+            'patch': f.get('patch', ''),  # The actual diff
+            'raw_url': f.get('raw_url', ''),
+            'contents_url': f.get('contents_url', '')
+        })
+    return changes
+
+
+def _cache_key(url: str, params: dict = None) -> str:
+    """ETag cache key for a GET of `url` with `params`."""
+    return url if not params else f"{url}?{'&'.join(f'{k}={v}' for k, v in sorted(params.items()))}"
+
 
-def fetch_pr_changes(repo_owner: str, repo_name: str, pr_number: int) -> list:
+async def _get_json(client: httpx.AsyncClient, url: str, params: dict = None,
+                    cache: ETagCache = None, slim=None, pr_version: str = None):
+    """GET a URL and return the decoded JSON body, its last page number and cache entry.
+
+    `slim` trims the decoded body so only the fields we use are kept in
+    memory and in the cache. When a cache is given the request is made
+    conditional on the cached ETag, and a 304 Not Modified response is
+    answered from the cache; the entry used is returned, or None when the
+    body was fetched. Given a `pr_version`, entries recorded for another
+    PR state are ignored, since a files page can keep its body (and ETag)
+    while the page count changes.
+    """
+    key = _cache_key(url, params)
+    entry = cache.get(key) if cache is not None else None
+    if entry is not None and pr_version is not None and entry.get('pr_version') != pr_version:
+        entry = None
+    headers = {'If-None-Match': entry['etag']} if entry else None
+
+    response, body = await _send(client, 'GET', url, params=params, headers=headers)
+    if response.status_code == 304:
+        if entry is not None:
+            # Prefer a page count GitHub sends with the 304 over the stored one
+            last_page = _last_page(response) if 'Link' in response.headers else entry['last_page']
+            return entry['payload'], last_page, entry
+        # Entry vanished underneath us; retry unconditionally
+        return await _get_json(client, url, params, slim=slim, pr_version=pr_version)
+
+    response.raise_for_status()
+    data = orjson.loads(body)
+    if slim is not None:
+        data = slim(data)
+    last_page = _last_page(response)
+    etag = response.headers.get('ETag')
+    if cache is not None and etag:
+        cache.set(key, etag, data, last_page, pr_version)
+    return data, last_page, None
+
+
+def _copy_pr_info(pr_info: dict) -> dict:
+    """Copy a PR result deep enough that callers can't modify the cached one."""
+    return {**pr_info, 'changes': [dict(change) for change in pr_info['changes']]}
+
+
+async def fetch_pr_changes(repo_owner: str, repo_name: str, pr_number: int,
+                           include_patches: bool = True) -> dict:
     """Fetch changes from a GitHub pull request.
-    
+
+    Results are kept in memory for `PR_CACHE_TTL` seconds, so repeated calls
+    for the same PR within that window make no HTTP requests at all. Past
+    that, the ETag cache still turns an unchanged PR into 304 responses.
+    Every call returns its own copy, so callers are free to modify it.
+
     Args:
         repo_owner: The owner of the GitHub repository
         repo_name: The name of the GitHub repository
         pr_number: The number of the pull request to analyze
-        
+        include_patches: Whether to include each file's `patch`, `raw_url`
+            and `contents_url`. Leaving them out makes the result much smaller.
+
     Returns:
-        A list of file changes with detailed information about each change
+        The PR metadata with a list of file changes, or None on failure
     """
-    print(f" Fetching PR changes for {repo_owner}/{repo_name}#{pr_number}")
-    
+    key = (repo_owner, repo_name, pr_number, include_patches)
+    with _pr_cache_lock:
+        pr_info = _pr_cache.get(key)
+    if pr_info is not None:
+        logger.info("Using cached PR changes for %s/%s#%s", repo_owner, repo_name, pr_number)
+        return _copy_pr_info(pr_info)
+
+    pr_info = await _fetch_pr_raw(repo_owner, repo_name, pr_number, include_patches)
+    if pr_info is None:
+        return None
+    with _pr_cache_lock:
+        _pr_cache[key] = pr_info
+    return _copy_pr_info(pr_info)
+
+
+async def _fetch_pr_raw(repo_owner: str, repo_name: str, pr_number: int,
+                        include_patches: bool = True) -> dict:
+    """Fetch PR metadata and every files page over REST, bypassing the memory cache."""
+    logger.info("Fetching PR changes for %s/%s#%s", repo_owner, repo_name, pr_number)
+
     # Fetch PR details
-    pr_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/pulls/{pr_number}"
-    files_url = f"{pr_url}/files"
-    headers = {'Authorization': f'token {GITHUB_TOKEN}'}
-    
+    pr_url = _url(repo_owner, repo_name, pr_number)
+    files_url = pr_url + "/files"
+
     try:
-        # Get PR metadata
-        pr_response = requests.get(pr_url, headers=headers)
-        pr_response.raise_for_status()
-        pr_data = pr_response.json()
-        
-        # Get file changes
-        files_response = requests.get(files_url, headers=headers)
-        files_response.raise_for_status()
-        files_data = files_response.json()
-        
-        # Combine PR metadata with file changes
-        changes = []
-        for file in files_data:
-            change = {
-                'filename': file['filename'],
-                'status': file['status'],  # added, modified, removed
-                'additions': file['additions'],
-                'deletions': file['deletions'],
-                'changes': file['changes'],
-                'patch': file.get('patch', ''),  # The actual diff
-                'raw_url': file.get('raw_url', ''),
-                'contents_url': file.get('contents_url', '')
-            }
-            changes.append(change)
-        
+        client = _get_client()
+        cache = _etag_cache
+        await cache.load()
+
+        # Get PR metadata and the first page of file changes concurrently
+        first_params = {'per_page': FILES_PER_PAGE, 'page': 1}
+        (pr_data, _, _), (first_page, last_page, first_entry) = await asyncio.gather(
+            _get_json(client, pr_url, cache=cache, slim=_slim_pr),
+            _get_json(client, files_url, first_params, cache, _slim_files),
+        )
+
+        # Cached files pages are only trusted for the PR state they were fetched for
+        pr_version = pr_data['updated_at']
+        if first_entry is None:
+            cache.set_pr_version(_cache_key(files_url, first_params), pr_version)
+        elif first_entry.get('pr_version') != pr_version:
+            first_page, last_page, _ = await _get_json(
+                client, files_url, first_params, cache, _slim_files, pr_version
+            )
+        pages = [first_page]
+
+        # Fan out the remaining pages once page 1 tells us how many there are
+        if last_page > 1:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+            async def fetch_page(page: int) -> list:
+                async with semaphore:
+                    data, _, _ = await _get_json(
+                        client, files_url, {'per_page': FILES_PER_PAGE, 'page': page},
+                        cache, _slim_files, pr_version
+                    )
+                    return data
+
+            pages.extend(await asyncio.gather(*(fetch_page(page) for page in range(2, last_page + 1))))
+
+        # Combine PR metadata with file changes. The diff fields are dropped
+        # here rather than in _slim_files so the ETag cache keeps them for
+        # callers that do want patches.
+        if include_patches:
+            changes = [change for page in pages for change in page]
+        else:
+            changes = [
+                {key: change[key] for key in _SUMMARY_FIELDS}
+                for page in pages for change in page
+            ]
+
         # Add PR metadata
         pr_info = {
             'title': pr_data['title'],
@@ -62,15 +581,138 @@ def fetch_pr_changes(repo_owner: str, repo_name: str, pr_number: int) -> list:
             'total_changes': len(changes),
             'changes': changes
         }
-        
-        print(f"Successfully fetched {len(changes)} changes")
+
+        await cache.save()
+
+        logger.info("Successfully fetched %d changes", len(changes))
         return pr_info
-        
+
     except Exception as e:
-        print(f"Error fetching PR changes: {str(e)}")
-        traceback.print_exc()
+        logger.exception("Error fetching PR changes: %s", e)
         return None
 
+
+async def fetch_pr_overview(repo_owner: str, repo_name: str, pr_number: int) -> dict:
+    """Fetch PR metadata and the changed-file list with a single GraphQL query.
+
+    GraphQL does not expose diffs, so the returned changes carry no `patch`,
+    `raw_url` or `contents_url`; use `fetch_pr_changes` when those are needed.
+    Further requests are only made for PRs with more than 100 files.
+
+    Args:
+        repo_owner: The owner of the GitHub repository
+        repo_name: The name of the GitHub repository
+        pr_number: The number of the pull request to analyze
+
+    Returns:
+        The same structure as `fetch_pr_changes`, without diff fields
+    """
+    logger.info("Fetching PR overview for %s/%s#%s", repo_owner, repo_name, pr_number)
+
+    variables = {'owner': repo_owner, 'name': repo_name, 'number': pr_number, 'after': None}
+
+    try:
+        client = _get_client()
+        changes = []
+
+        while True:
+            # A read-only query, so it is safe to retry like a GET
+            response, body = await _send(
+                client, 'POST', GRAPHQL_URL, idempotent=True,
+                json={'query': PR_FILES_QUERY, 'variables': variables}
+            )
+            response.raise_for_status()
+            result = orjson.loads(body)
+            if result.get('errors'):
+                raise RuntimeError(result['errors'][0].get('message', 'GraphQL query failed'))
+
+            pr_data = result['data']['repository']['pullRequest']
+            files = pr_data['files']
+            changes.extend(
+                {
+                    'filename': node['path'],
+                    'status': _CHANGE_TYPE_STATUS.get(node['changeType'], node['changeType'].lower()),
+                    'additions': node['additions'],
+                    'deletions': node['deletions'],
+                    'changes': node['additions'] + node['deletions']
+                }
+                for node in files['nodes']
+            )
+
+            if not files['pageInfo']['hasNextPage']:
+                break
+            variables['after'] = files['pageInfo']['endCursor']
+
+        pr_info = {
+            'title': pr_data['title'],
+            'description': pr_data['body'],
+            'author': (pr_data['author'] or {}).get('login'),
+            'created_at': pr_data['createdAt'],
+            'updated_at': pr_data['updatedAt'],
+            # REST reports merged PRs as closed
+            'state': 'open' if pr_data['state'] == 'OPEN' else 'closed',
+            'total_changes': len(changes),
+            'changes': changes
+        }
+
+        logger.info("Successfully fetched %d changes", len(changes))
+        return pr_info
+
+    except Exception as e:
+        logger.exception("Error fetching PR overview: %s", e)
+        return None
+
+
+async def submit_pr_review(repo_owner: str, repo_name: str, pr_number: int, review_body: str,
+                           comments: list = None, event: str = 'COMMENT') -> dict:
+    """Submit a review on a GitHub pull request.
+
+    The overview and every line comment go out in a single review POST.
+
+    Args:
+        repo_owner: The owner of the GitHub repository
+        repo_name: The name of the GitHub repository
+        pr_number: The number of the pull request to review
+        review_body: The overall review text
+        comments: Line comments, each a dict with `path`, `body` and `line`
+            (plus optional `side`, `start_line`, `start_side`)
+        event: One of COMMENT, APPROVE or REQUEST_CHANGES
+
+    Returns:
+        The created review, or None on failure
+    """
+    logger.info("Submitting review for %s/%s#%s", repo_owner, repo_name, pr_number)
+
+    reviews_url = _url(repo_owner, repo_name, pr_number, "/reviews")
+    payload = {'body': review_body, 'event': event}
+    if comments:
+        payload['comments'] = comments
+
+    try:
+        client = _get_client()
+        response, body = await _send(client, 'POST', reviews_url, json=payload)
+        response.raise_for_status()
+        review = orjson.loads(body)
+
+        logger.info("Successfully submitted review with %d comments", len(comments or []))
+        return review
+
+    except Exception as e:
+        logger.exception("Error submitting PR review: %s", e)
+        return None
+
+
+def fetch_pr_changes_sync(repo_owner: str, repo_name: str, pr_number: int,
+                          include_patches: bool = True) -> dict:
+    """Blocking wrapper around `fetch_pr_changes` for non-async callers."""
+    async def _run():
+        client = _get_client()
+        try:
+            return await fetch_pr_changes(repo_owner, repo_name, pr_number, include_patches)
+        finally:
+            await _release_client(client)
+    return asyncio.run(_run())
+
 # Example usage for debugging
-# pr_data = fetch_pr_changes('owner', 'repo', 1)
-# print(pr_data) 
\ No newline at end of file
+# pr_data = fetch_pr_changes_sync('owner', 'repo', 1)
+# print(pr_data)
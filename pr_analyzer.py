@@ -1,12 +1,60 @@
 import sys
 import os
-import traceback
+import copy
+import asyncio
+import logging
 from typing import Any, List, Dict
 from mcp.server.fastmcp import FastMCP
-from github_integration import fetch_pr_changes
+from github_integration import fetch_pr_changes, fetch_pr_overview, submit_pr_review
 from notion_client import Client
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
+# Notion rejects rich_text content over 2000 characters; stay under it
+NOTION_TEXT_LIMIT = 1900
+# Notion accepts at most 100 child blocks per request
+NOTION_MAX_BLOCKS = 100
+
+
+def _chunk_to_blocks(content: str, max_len: int = NOTION_TEXT_LIMIT) -> List[Dict[str, Any]]:
+    """Split content into paragraph blocks of at most max_len characters.
+
+    Splits happen at line breaks where possible; the block boundary stands in
+    for the newline it replaces. A single line longer than max_len is cut
+    into max_len pieces.
+    """
+    chunks = []
+    current = []
+    current_len = 0
+    for line in content.splitlines():
+        while len(line) > max_len:
+            if current:
+                chunks.append("\n".join(current))
+                current, current_len = [], 0
+            chunks.append(line[:max_len])
+            line = line[max_len:]
+        # Joining onto the current chunk costs the line plus its newline
+        if current and current_len + 1 + len(line) > max_len:
+            chunks.append("\n".join(current))
+            current, current_len = [], 0
+        current_len += len(line) + (1 if current else 0)
+        current.append(line)
+    if current or not chunks:
+        chunks.append("\n".join(current))
+
+    return [{
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": [{
+                "type": "text",
+                "text": {"content": chunk}
+            }]
+        }
+    } for chunk in chunks]
+
+
 class PRAnalyzer:
     def __init__(self):
         # Load environment variables
@@ -14,7 +62,7 @@ class PRAnalyzer:
         
         # Initialize MCP Server
         self.mcp = FastMCP("github_pr_analysis")
-        print("MCP Server initialized", file=sys.stderr)
+        logger.info("MCP Server initialized")
         
         # Initialize Notion client
         self._init_notion()
@@ -35,19 +83,24 @@ class PRAnalyzer:
                 raise ValueError("Missing Notion API key or page ID in environment variables")
             
             self.notion = Client(auth=self.notion_api_key)
-            print(f"Notion client initialized successfully", file=sys.stderr)
-            print(f"Using Notion page ID: {self.notion_page_id}", file=sys.stderr)
+
+            # Page payload prototype; create_notion_page copies it and fills in the text
+            self._page_proto = {
+                "parent": {"type": "page_id", "page_id": self.notion_page_id},
+                "properties": {"title": {"title": [{"text": {"content": None}}]}}
+            }
+            logger.info("Notion client initialized successfully")
+            logger.info("Using Notion page ID: %s", self.notion_page_id)
         except Exception as e:
-            print(f"Error initializing Notion client: {str(e)}", file=sys.stderr)
-            traceback.print_exc(file=sys.stderr)
+            logger.exception("Error initializing Notion client: %s", e)
             sys.exit(1)
     
     async def _handle_resource_methods(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle MCP protocol resource methods."""
-        print(f"Handling resource method: {method}", file=sys.stderr)
+        logger.info("Handling resource method: %s", method)
         
         if method == "resources/list":
-            print("Processing resources/list request", file=sys.stderr)
+            logger.info("Processing resources/list request")
             return {
                 "resources": [
                     {
@@ -57,6 +110,20 @@ class PRAnalyzer:
                             {
                                 "name": "fetch_pr",
                                 "description": "Fetch changes from a GitHub pull request",
+                                "parameters": {
+                                    "type": "object",
+                                    "properties": {
+                                        "repo_owner": {"type": "string"},
+                                        "repo_name": {"type": "string"},
+                                        "pr_number": {"type": "integer"},
+                                        "include_patches": {"type": "boolean", "default": True}
+                                    },
+                                    "required": ["repo_owner", "repo_name", "pr_number"]
+                                }
+                            },
+                            {
+                                "name": "fetch_pr_overview",
+                                "description": "Fetch a GitHub pull request's metadata and changed files, without diffs",
                                 "parameters": {
                                     "type": "object",
                                     "properties": {
@@ -67,6 +134,32 @@ class PRAnalyzer:
                                     "required": ["repo_owner", "repo_name", "pr_number"]
                                 }
                             },
+                            {
+                                "name": "submit_pr_review_with_comments",
+                                "description": "Submit a PR review overview and its line comments in one request",
+                                "parameters": {
+                                    "type": "object",
+                                    "properties": {
+                                        "repo_owner": {"type": "string"},
+                                        "repo_name": {"type": "string"},
+                                        "pr_number": {"type": "integer"},
+                                        "overview_body": {"type": "string"},
+                                        "line_comments": {
+                                            "type": "array",
+                                            "items": {
+                                                "type": "object",
+                                                "properties": {
+                                                    "path": {"type": "string"},
+                                                    "line": {"type": "integer"},
+                                                    "body": {"type": "string"}
+                                                },
+                                                "required": ["path", "line", "body"]
+                                            }
+                                        }
+                                    },
+                                    "required": ["repo_owner", "repo_name", "pr_number", "overview_body"]
+                                }
+                            },
                             {
                                 "name": "create_notion_page",
                                 "description": "Create a Notion page with PR analysis",
@@ -84,64 +177,112 @@ class PRAnalyzer:
                 ]
             }
         else:
-            print(f"Unknown resource method: {method}", file=sys.stderr)
+            logger.warning("Unknown resource method: %s", method)
             return {}
     
     def _register_tools(self):
         """Register MCP tools for PR analysis."""
         @self.mcp.tool()
-        async def fetch_pr(repo_owner: str, repo_name: str, pr_number: int) -> Dict[str, Any]:
-            """Fetch changes from a GitHub pull request."""
-            print(f"Fetching PR #{pr_number} from {repo_owner}/{repo_name}", file=sys.stderr)
+        async def fetch_pr(repo_owner: str, repo_name: str, pr_number: int,
+                           include_patches: bool = True) -> Dict[str, Any]:
+            """Fetch changes from a GitHub pull request.
+
+            Set include_patches to false when only the list of changed files
+            is needed; the diffs are left out and the response is much smaller.
+            """
+            logger.info("Fetching PR #%s from %s/%s", pr_number, repo_owner, repo_name)
             try:
-                pr_info = fetch_pr_changes(repo_owner, repo_name, pr_number)
+                pr_info = await fetch_pr_changes(repo_owner, repo_name, pr_number, include_patches)
                 if pr_info is None:
-                    print("No changes returned from fetch_pr_changes", file=sys.stderr)
+                    logger.warning("No changes returned from fetch_pr_changes")
                     return {}
-                print(f"Successfully fetched PR information", file=sys.stderr)
+                logger.info("Successfully fetched PR information")
                 return pr_info
             except Exception as e:
-                print(f"Error fetching PR: {str(e)}", file=sys.stderr)
-                traceback.print_exc(file=sys.stderr)
+                logger.exception("Error fetching PR: %s", e)
                 return {}
         
+        @self.mcp.tool(name="fetch_pr_overview")
+        async def fetch_pr_overview_tool(repo_owner: str, repo_name: str, pr_number: int) -> Dict[str, Any]:
+            """Fetch a GitHub pull request's metadata and changed files, without diffs.
+
+            Uses a single GraphQL query, so it is cheaper than fetch_pr for
+            getting an overview first. Requires a GitHub token.
+            """
+            logger.info("Fetching overview of PR #%s from %s/%s", pr_number, repo_owner, repo_name)
+            try:
+                pr_info = await fetch_pr_overview(repo_owner, repo_name, pr_number)
+                if pr_info is None:
+                    logger.warning("No overview returned from fetch_pr_overview")
+                    return {}
+                logger.info("Successfully fetched PR overview")
+                return pr_info
+            except Exception as e:
+                logger.exception("Error fetching PR overview: %s", e)
+                return {}
+
+        @self.mcp.tool()
+        async def submit_pr_review_with_comments(repo_owner: str, repo_name: str, pr_number: int,
+                                                 overview_body: str,
+                                                 line_comments: List[Dict[str, Any]] = None) -> str:
+            """Submit a PR review overview and all of its line comments as one review.
+
+            Prefer this over posting comments one by one: everything goes out
+            in a single request. Each line comment needs `path`, `line` and `body`.
+            Several PR-level remarks should be joined into the overview body.
+            """
+            logger.info("Submitting review for PR #%s in %s/%s", pr_number, repo_owner, repo_name)
+            try:
+                review = await submit_pr_review(
+                    repo_owner, repo_name, pr_number,
+                    review_body=overview_body, comments=line_comments
+                )
+                if review is None:
+                    return "Error submitting PR review"
+                logger.info("Successfully submitted PR review")
+                return f"Review submitted: {review.get('html_url', '')}"
+            except Exception as e:
+                error_msg = f"Error submitting PR review: {str(e)}"
+                logger.exception(error_msg)
+                return error_msg
+
         @self.mcp.tool()
         async def create_notion_page(title: str, content: str) -> str:
             """Create a Notion page with PR analysis."""
-            print(f"Creating Notion page: {title}", file=sys.stderr)
+            logger.info("Creating Notion page: %s", title)
             try:
-                self.notion.pages.create(
-                    parent={"type": "page_id", "page_id": self.notion_page_id},
-                    properties={"title": {"title": [{"text": {"content": title}}]}},
-                    children=[{
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {
-                            "rich_text": [{
-                                "type": "text",
-                                "text": {"content": content}
-                            }]
-                        }
-                    }]
-                )
-                print(f"Notion page '{title}' created successfully!", file=sys.stderr)
+                blocks = _chunk_to_blocks(content)
+                payload = copy.deepcopy(self._page_proto)
+                payload["properties"]["title"]["title"][0]["text"]["content"] = title
+                payload["children"] = blocks[:NOTION_MAX_BLOCKS]
+                # notion-client is synchronous; keep it off the event loop
+                page = await asyncio.to_thread(self.notion.pages.create, **payload)
+
+                # Only very long content needs more than the one create call
+                for start in range(NOTION_MAX_BLOCKS, len(blocks), NOTION_MAX_BLOCKS):
+                    await asyncio.to_thread(
+                        self.notion.blocks.children.append,
+                        block_id=page["id"],
+                        children=blocks[start:start + NOTION_MAX_BLOCKS]
+                    )
+                logger.info("Notion page '%s' created successfully!", title)
                 return f"Notion page '{title}' created successfully!"
             except Exception as e:
                 error_msg = f"Error creating Notion page: {str(e)}"
-                print(error_msg, file=sys.stderr)
-                traceback.print_exc(file=sys.stderr)
+                logger.exception(error_msg)
                 return error_msg
     
     def run(self):
         """Start the MCP server."""
         try:
-            print("Running MCP Server for GitHub PR Analysis...", file=sys.stderr)
+            logger.info("Running MCP Server for GitHub PR Analysis...")
             self.mcp.run(transport="stdio")
         except Exception as e:
-            print(f"Fatal Error in MCP Server: {str(e)}", file=sys.stderr)
-            traceback.print_exc(file=sys.stderr)
+            logger.exception("Fatal Error in MCP Server: %s", e)
             sys.exit(1)
 
 if __name__ == "__main__":
+    # Logs go to stderr; stdout carries the MCP stdio transport
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
     analyzer = PRAnalyzer()
     analyzer.run() 
\ No newline at end of file